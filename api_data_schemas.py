@@ -4,8 +4,9 @@ of the GNU General Public License, v. 3.0. If a copy of the GNU General
 Public License was not distributed with this file, see <https://www.gnu.org/licenses/>.
 """
 
-from typing import Literal, List, Union
-from pydantic import BaseModel, Field
+from datetime import date
+from typing import Literal, List, Optional, Union
+from pydantic import BaseModel, Field, model_validator
 from fastapi import Query
 
 
@@ -204,6 +205,64 @@ class PublicationsResponse(BaseModel):
     publications: PublicationsSummary
 
 
+class PublicationsAggregateParams(BaseModel):
+    """Parameters for grouping and counting publications."""
+
+    start_date: date = Field(description="Start date in 'YYYY-MM-DD' format.")
+    end_date: date = Field(description="End date in 'YYYY-MM-DD' format.")
+    granularity: Literal["day", "month"] = Field(
+        default="day", description="Granularity of data."
+    )
+    group_by: List[
+        Literal["country_code", "platform_name", "source", "status", "gateway_client"]
+    ] = Query(default=[], description="Dimensions to group results by.")
+    country_code: str = Field(
+        default=None, description="2-character ISO region code.", max_length=2
+    )
+    platform_name: str = Field(
+        default=None, description="Filter by platform name (e.g., 'Twitter')."
+    )
+    source: str = Field(default=None, description="Filter by source of publication.")
+    status: Literal["published", "failed"] = Field(
+        default=None, description="Filter by publication status."
+    )
+    gateway_client: str = Field(
+        default=None, description="Filter by the gateway client."
+    )
+
+    @model_validator(mode="after")
+    def check_date_range(self):
+        """Ensure the date range is not reversed."""
+        if self.start_date > self.end_date:
+            raise ValueError("start_date must not be after end_date")
+        return self
+
+
+class PublicationsAggregateData(BaseModel):
+    """Publication count for a date bucket and dimension combination."""
+
+    timeframe: str
+    country_code: Optional[str] = None
+    platform_name: Optional[str] = None
+    source: Optional[str] = None
+    status: Optional[str] = None
+    gateway_client: Optional[str] = None
+    count: int
+
+
+class PublicationsAggregateDetails(BaseModel):
+    """Details of the grouped publication counts."""
+
+    total: int
+    data: List[PublicationsAggregateData]
+
+
+class PublicationsAggregateResponse(BaseModel):
+    """Response model containing grouped publication counts."""
+
+    aggregate: PublicationsAggregateDetails
+
+
 class ErrorResponse(BaseModel):
     """Response model for errors."""
 
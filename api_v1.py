@@ -13,6 +13,8 @@ from fastapi.responses import JSONResponse
 from api_data_schemas import (
     ErrorResponse,
     MetricsParams,
+    PublicationsAggregateParams,
+    PublicationsAggregateResponse,
     PublicationsParams,
     PublicationsResponse,
     RetainedResponse,
@@ -20,7 +22,14 @@ from api_data_schemas import (
     SummaryParams,
     SummaryResponse,
 )
-from data_retriever import get_publications, get_retained, get_signup, get_summary
+from data_retriever import (
+    get_publications,
+    get_publications_aggregate,
+    get_publications_window,
+    get_retained,
+    get_signup,
+    get_summary,
+)
 
 router = APIRouter(prefix="/v1", tags=["API V1"])
 
@@ -184,3 +193,46 @@ def publications(query: Annotated[PublicationsParams, Query()]):
             status_code=e.response.status_code, detail=e.response.json()
         ) from e
 
+
+@router.get(
+    "/publications/aggregate",
+    responses={
+        400: {"model": ErrorResponse},
+        422: {"model": ErrorResponse},
+        500: {"model": ErrorResponse},
+        503: {"model": ErrorResponse},
+    },
+    response_model=PublicationsAggregateResponse,
+)
+def publications_aggregate(query: Annotated[PublicationsAggregateParams, Query()]):
+    """Fetch publication counts grouped by date and dimensions."""
+
+    window_start = get_publications_window()
+    if window_start is None:
+        raise HTTPException(
+            status_code=503,
+            detail={"error": "Publications are still syncing. Please try again later."},
+        )
+    if query.start_date < window_start:
+        raise HTTPException(
+            status_code=400,
+            detail={"error": f"start_date must not be before {window_start}."},
+        )
+
+    params = {
+        "start_date": query.start_date,
+        "end_date": query.end_date,
+        "granularity": query.granularity,
+        "group_by": query.group_by,
+        "country_code": query.country_code,
+        "platform_name": query.platform_name,
+        "source": query.source,
+        "status": query.status,
+        "gateway_client": query.gateway_client,
+    }
+
+    aggregate_data = get_publications_aggregate(params)
+
+    response_data = {"aggregate": aggregate_data}
+
+    return JSONResponse(content=response_data, headers=get_security_headers())
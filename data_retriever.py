@@ -4,20 +4,90 @@ of the GNU General Public License, v. 3.0. If a copy of the GNU General
 Public License was not distributed with this file, see <https://www.gnu.org/licenses/>.
 """
 
+import threading
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+
 import requests
+from requests.adapters import HTTPAdapter
 from logutils import get_logger
 from utils import get_env_var
+from publications_store import DIMENSIONS, publications_store
 
 logger = get_logger(__name__)
 
-VAULT_DOMAIN = get_env_var("RELAYSMS_VAULT_DOMAIN", strict=True)
-VAULT_PORT = get_env_var("RELAYSMS_VAULT_PORT", default_value=443)
-VAULT_URL = f"{VAULT_DOMAIN}:{VAULT_PORT}"
-PUBLISHER_DOMAIN = get_env_var("RELAYSMS_PUBLISHER_DOMAIN", strict=True)
-PUBLISHER_PORT = get_env_var("RELAYSMS_PUBLISHER_PORT", default_value=443)
-PUBLISHER_URL = f"{PUBLISHER_DOMAIN}:{PUBLISHER_PORT}"
+INITIAL_SYNC_RETRY_INTERVAL = 10
+
+_refresher_stop = threading.Event()
+_refresher_thread = None
+_session = None
+_session_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def get_vault_url() -> str:
+    """Resolve the Vault base URL from the environment on first use."""
+    vault_domain = get_env_var("RELAYSMS_VAULT_DOMAIN", strict=True)
+    vault_port = get_env_var("RELAYSMS_VAULT_PORT", default_value=443)
+    return f"{vault_domain}:{vault_port}"
+
+
+@lru_cache(maxsize=None)
+def get_publisher_url() -> str:
+    """Resolve the Publisher base URL from the environment on first use."""
+    publisher_domain = get_env_var("RELAYSMS_PUBLISHER_DOMAIN", strict=True)
+    publisher_port = get_env_var("RELAYSMS_PUBLISHER_PORT", default_value=443)
+    return f"{publisher_domain}:{publisher_port}"
+
 
-publisher_metrics = f"{PUBLISHER_URL}/v1/metrics/publications"
+def get_session() -> requests.Session:
+    """
+    Return the pooled HTTP session shared by upstream calls.
+
+    The session is built on first use and shared across the request threads
+    and the publications refresher; it is only used for stateless GETs.
+    The pool size is set by RELAYSMS_HTTP_POOL_SIZE and defaults to the
+    size of the thread pool that runs sync endpoints, so connections are
+    not discarded under load.
+    """
+    global _session
+
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                pool_size = int(
+                    get_env_var("RELAYSMS_HTTP_POOL_SIZE", default_value=40)
+                )
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=pool_size, pool_maxsize=pool_size
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _session = session
+    return _session
+
+
+def check_config():
+    """
+    Resolve upstream configuration and build the HTTP session.
+
+    Raises:
+        KeyError: If a required environment variable is missing.
+        ValueError: If a required environment variable is empty.
+    """
+    get_vault_url()
+    get_publisher_url()
+    get_session()
+
+
+def is_ready() -> bool:
+    """Return True once upstream configuration and the HTTP session are set up."""
+    return (
+        _session is not None
+        and get_vault_url.cache_info().currsize > 0
+        and get_publisher_url.cache_info().currsize > 0
+    )
 
 
 def get_summary(params: dict):
@@ -33,14 +103,14 @@ def get_summary(params: dict):
     Raises:
         HTTPError: If any of the external API calls fail.
     """
-    retained_metrics_url = f"{VAULT_URL}/v3/metrics/retained"
-    signup_metrics_url = f"{VAULT_URL}/v3/metrics/signup"
+    retained_metrics_url = f"{get_vault_url()}/v3/metrics/retained"
+    signup_metrics_url = f"{get_vault_url()}/v3/metrics/signup"
+    publisher_metrics_url = f"{get_publisher_url()}/v1/metrics/publications"
+    session = get_session()
 
     try:
-        retained_response = requests.get(
-            retained_metrics_url, params=params, timeout=30
-        )
-        signup_response = requests.get(signup_metrics_url, params=params, timeout=30)
+        retained_response = session.get(retained_metrics_url, params=params, timeout=30)
+        signup_response = session.get(signup_metrics_url, params=params, timeout=30)
 
         retained_response.raise_for_status()
         signup_response.raise_for_status()
@@ -48,7 +118,9 @@ def get_summary(params: dict):
         retained_metrics = retained_response.json()
         signup_metrics = signup_response.json()
 
-        publisher_response = requests.get(publisher_metrics, params=params, timeout=30)
+        publisher_response = session.get(
+            publisher_metrics_url, params=params, timeout=30
+        )
         publisher_response.raise_for_status()
         publisher_metrics_data = publisher_response.json()
 
@@ -97,10 +169,12 @@ def get_signup(params: dict):
     Returns:
         dict: The JSON response from the metrics API containing signup data.
     """
-    signup_metrics_url = f"{VAULT_URL}/v3/metrics/signup"
+    signup_metrics_url = f"{get_vault_url()}/v3/metrics/signup"
 
     try:
-        signup_response = requests.get(signup_metrics_url, params=params, timeout=30)
+        signup_response = get_session().get(
+            signup_metrics_url, params=params, timeout=30
+        )
 
         signup_response.raise_for_status()
 
@@ -127,10 +201,10 @@ def get_retained(params: dict):
     Returns:
         dict: The JSON response from the metrics API containing retained data.
     """
-    retained_metrics_url = f"{VAULT_URL}/v3/metrics/retained"
+    retained_metrics_url = f"{get_vault_url()}/v3/metrics/retained"
 
     try:
-        retained_response = requests.get(
+        retained_response = get_session().get(
             retained_metrics_url, params=params, timeout=30
         )
 
@@ -159,12 +233,144 @@ def get_publications(params: dict):
     Returns:
         dict: The JSON response from the Publisher API containing publication data.
     """
+    publisher_metrics_url = f"{get_publisher_url()}/v1/metrics/publications"
 
     try:
-        response = requests.get(publisher_metrics, params=params, timeout=30)
+        response = get_session().get(publisher_metrics_url, params=params, timeout=30)
         response.raise_for_status()
         return response.json()
 
     except requests.RequestException as e:
         logger.error(f"Error fetching publications: {e}")
         raise e
+
+
+def refresh_publications(today: date = None) -> int:
+    """
+    Mirrors new publications into the publications store.
+
+    Fetches, page by page, every day from the first one not yet fully
+    ingested through today, then drops days that fall outside the
+    retention window set by RELAYSMS_PUBLICATIONS_RETENTION_DAYS.
+
+    Args:
+        today (date, optional): The current UTC date. Defaults to now.
+
+    Returns:
+        int: The number of publications added to the store.
+    """
+    today = today or datetime.now(timezone.utc).date()
+    retention_days = int(
+        get_env_var("RELAYSMS_PUBLICATIONS_RETENTION_DAYS", default_value=365)
+    )
+    oldest = today - timedelta(days=retention_days - 1)
+    start_date = publications_store.pending_start(oldest)
+
+    params = {
+        "start_date": start_date.isoformat(),
+        "end_date": today.isoformat(),
+        "page": 1,
+        "page_size": 100,
+    }
+    added = 0
+
+    while True:
+        publications_data = get_publications(params)
+        added += publications_store.ingest(publications_data["data"])
+        if params["page"] >= publications_data["pagination"]["total_pages"]:
+            break
+        params["page"] += 1
+
+    evicted = publications_store.evict_before(oldest)
+    publications_store.mark_final_before(today)
+    publications_store.materialize_rollups()
+    logger.debug(
+        "Refreshed publications from %s to %s: %d added, %d evicted",
+        start_date,
+        today,
+        added,
+        evicted,
+    )
+    return added
+
+
+def _run_publications_refresher(interval: float):
+    """Refresh publications until the refresher is stopped."""
+    while not _refresher_stop.is_set():
+        try:
+            refresh_publications()
+        except Exception as e:
+            logger.exception("Error refreshing publications: %s", e)
+        _refresher_stop.wait(
+            interval
+            if get_publications_window() is not None
+            else min(interval, INITIAL_SYNC_RETRY_INTERVAL)
+        )
+
+
+def start_publications_refresher():
+    """
+    Starts refreshing publications in a background thread.
+
+    The interval in seconds is set by RELAYSMS_PUBLICATIONS_REFRESH_INTERVAL.
+    """
+    global _refresher_thread
+
+    interval = float(
+        get_env_var("RELAYSMS_PUBLICATIONS_REFRESH_INTERVAL", default_value=300)
+    )
+    _refresher_stop.clear()
+    _refresher_thread = threading.Thread(
+        target=_run_publications_refresher,
+        args=(interval,),
+        name="publications-refresher",
+        daemon=True,
+    )
+    _refresher_thread.start()
+
+
+def stop_publications_refresher():
+    """Stops the background publications refresher."""
+    _refresher_stop.set()
+    if _refresher_thread is not None:
+        _refresher_thread.join(timeout=5)
+
+
+def get_publications_window():
+    """
+    Returns the first day covered by the publications store.
+
+    Returns:
+        date: The oldest retained day, or None until the initial sync completes.
+    """
+    if publications_store.final_before is None:
+        return None
+    return publications_store.oldest
+
+
+def get_publications_aggregate(params: dict):
+    """
+    Counts publications grouped by date bucket and publication dimensions.
+
+    Answers from the publications store only; it is kept up to date by the
+    background refresher.
+
+    Args:
+        params (dict): Query parameters for the aggregation.
+            - start_date (date): First day to count.
+            - end_date (date): Last day to count (inclusive).
+            - granularity (str): Date bucket size, 'day' or 'month'.
+            - group_by (list): Dimensions to group by.
+            - country_code, platform_name, source, status, gateway_client
+              (str, optional): Filters to apply.
+
+    Returns:
+        dict: The total count and grouped counts of publications.
+    """
+    return publications_store.group_count(
+        params["start_date"],
+        params["end_date"],
+        group_by=params["group_by"],
+        granularity=params["granularity"],
+        filters={name: params.get(name) for name in DIMENSIONS},
+    )
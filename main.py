@@ -4,14 +4,32 @@ of the GNU General Public License, v. 3.0. If a copy of the GNU General
 Public License was not distributed with this file, see <https://www.gnu.org/licenses/>.
 """
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, HTTPException
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
 from api_v1 import router as api_v1_router
+from data_retriever import (
+    check_config,
+    is_ready,
+    start_publications_refresher,
+    stop_publications_refresher,
+)
 from logutils import get_logger
 
 logger = get_logger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(_):
+    """Validate configuration, then serve while publications sync."""
+    check_config()
+    start_publications_refresher()
+    yield
+    stop_publications_refresher()
+
+
 app = FastAPI(
     title="RelaySMS Telemetry API",
     description=(
@@ -20,6 +38,7 @@ app = FastAPI(
     ),
     redoc_url=None,
     swagger_ui_parameters={"defaultModelsExpandDepth": -1},
+    lifespan=lifespan,
 )
 
 
@@ -50,3 +69,11 @@ def internal_exception_handler(_, exc: Exception):
 
 
 app.include_router(api_v1_router)
+
+
+@app.get("/ready", include_in_schema=False)
+def readiness():
+    """Report whether upstream configuration and the HTTP session are set up."""
+    if not is_ready():
+        return JSONResponse({"status": "starting"}, status_code=503)
+    return JSONResponse({"status": "ready"})
@@ -0,0 +1,334 @@
+"""
+A module for mirroring publications into a compact in-memory store.
+
+This program is free software: you can redistribute it under the terms
+of the GNU General Public License, v. 3.0. If a copy of the GNU General
+Public License was not distributed with this file, see <https://www.gnu.org/licenses/>.
+"""
+
+import threading
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+from itertools import combinations, groupby
+
+from logutils import get_logger
+
+logger = get_logger(__name__)
+
+DIMENSIONS = ("country_code", "platform_name", "source", "status", "gateway_client")
+
+
+def _parse_timestamp(value: str) -> datetime:
+    """Parse an ISO 8601 timestamp, assuming UTC when no offset is given."""
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def _rollup(counts: dict, positions: tuple) -> dict:
+    """Sum combination counts over the dimensions at the given positions."""
+    rollup = Counter()
+    for codes, count in counts.items():
+        rollup[tuple(codes[i] for i in positions)] += count
+    return rollup
+
+
+class DictionaryColumn:
+    """A string column stored as integer codes into a dictionary of values."""
+
+    def __init__(self):
+        self.values = []
+        self._lookup = {}
+
+    def encode(self, value) -> int:
+        """Return the code for a value, adding it to the dictionary if new."""
+        value = "" if value is None else str(value)
+        code = self._lookup.get(value)
+        if code is None:
+            code = len(self.values)
+            self._lookup[value] = code
+            self.values.append(value)
+        return code
+
+    def code_of(self, value):
+        """Return the code for a value, or None if the value was never seen."""
+        return self._lookup.get(value)
+
+
+class DayPartition:
+    """
+    Publications recorded on a single UTC day.
+
+    Ids are kept in an array sorted by id to detect duplicates. `counts`
+    holds the number of rows per combination of dimension codes, and
+    `rollups` caches those counts summed over subsets of the dimensions.
+    """
+
+    def __init__(self):
+        self.ids = array("q")
+        self.counts = {}
+        self.rollups = {}
+
+    def __len__(self):
+        return len(self.ids)
+
+    def insert(self, row_id: int) -> bool:
+        """Insert an id in order, returning False if it is already present."""
+        index = bisect_left(self.ids, row_id)
+        if index < len(self.ids) and self.ids[index] == row_id:
+            return False
+        self.ids.insert(index, row_id)
+        return True
+
+
+class PublicationsStore:
+    """
+    Dictionary-encoded mirror of publication counts with group-by/count support.
+
+    Rows are partitioned by UTC day. Days before `oldest` have been evicted,
+    if any eviction has run. Days before `final_before` have been
+    fully ingested and are not fetched again; their counts are treated as
+    immutable so queries can read them, and cache rollups of them, without
+    holding the lock. Counts of days still being ingested are copied under
+    the lock when queried.
+    """
+
+    def __init__(self):
+        self.columns = {name: DictionaryColumn() for name in DIMENSIONS}
+        self.final_before = None
+        self.oldest = None
+        self._partitions = {}
+        self._days = []
+        self._month_rollups = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return sum(len(partition) for partition in self._partitions.values())
+
+    def _is_final(self, day: int) -> bool:
+        return self.final_before is not None and day < self.final_before.toordinal()
+
+    @staticmethod
+    def _is_cacheable_month(
+        day: int, start_date: date, end_date: date, final_before: date
+    ) -> bool:
+        """Whether the month containing a day is finalized and fully in range."""
+        month_start = date.fromordinal(day).replace(day=1)
+        next_month = (month_start + timedelta(days=31)).replace(day=1)
+        return (
+            final_before is not None
+            and start_date <= month_start
+            and next_month <= end_date + timedelta(days=1)
+            and next_month <= final_before
+        )
+
+    def ingest(self, rows) -> int:
+        """
+        Add publication rows to the store, skipping ids already present.
+
+        Args:
+            rows (iterable): Publication rows as returned by the Publisher API.
+
+        Returns:
+            int: The number of rows added.
+        """
+        added = 0
+        with self._lock:
+            for row in rows:
+                day = _parse_timestamp(row["date_time"]).date().toordinal()
+                codes = tuple(
+                    self.columns[name].encode(row.get(name)) for name in DIMENSIONS
+                )
+                partition = self._partitions.get(day)
+                if partition is None:
+                    partition = self._partitions[day] = DayPartition()
+                    insort(self._days, day)
+                if not partition.insert(int(row["id"])):
+                    continue
+                if self._is_final(day):
+                    # Late row for a finalized day: replace rather than mutate
+                    # so that queries reading it without the lock stay valid.
+                    partition.counts = dict(partition.counts)
+                    partition.rollups = {}
+                    self._month_rollups = {}
+                partition.counts[codes] = partition.counts.get(codes, 0) + 1
+                added += 1
+        return added
+
+    def evict_before(self, oldest: date) -> int:
+        """
+        Drop partitions for days before a date.
+
+        Args:
+            oldest (date): The oldest day to keep.
+
+        Returns:
+            int: The number of rows dropped.
+        """
+        with self._lock:
+            self.oldest = oldest
+            index = bisect_left(self._days, oldest.toordinal())
+            evicted, self._days = self._days[:index], self._days[index:]
+            if evicted:
+                self._month_rollups = {}
+            return sum(len(self._partitions.pop(day)) for day in evicted)
+
+    def pending_start(self, oldest: date) -> date:
+        """Return the first day that still needs fetching, no earlier than oldest."""
+        with self._lock:
+            if self.final_before is None or self.final_before < oldest:
+                return oldest
+            return self.final_before
+
+    def mark_final_before(self, day: date):
+        """Record that every day before the given one has been fully ingested."""
+        with self._lock:
+            if self.final_before is None or day > self.final_before:
+                self.final_before = day
+
+    def materialize_rollups(self, max_dimensions: int = 2):
+        """
+        Precompute rollups of finalized days over small dimension subsets.
+
+        Runs without holding the lock, so it can be called from the refresher
+        after new days are finalized to keep first queries fast.
+
+        Args:
+            max_dimensions (int): Largest subset of dimensions to precompute.
+        """
+        subsets = [
+            positions
+            for size in range(max_dimensions + 1)
+            for positions in combinations(range(len(DIMENSIONS)), size)
+        ]
+        with self._lock:
+            targets = [
+                (partition.counts, partition.rollups)
+                for day, partition in self._partitions.items()
+                if self._is_final(day)
+            ]
+
+        for counts, rollups in targets:
+            for positions in subsets:
+                if positions not in rollups:
+                    rollups[positions] = _rollup(counts, positions)
+
+    def group_count(
+        self,
+        start_date: date,
+        end_date: date,
+        group_by=(),
+        granularity: str = "day",
+        filters: dict = None,
+    ) -> dict:
+        """
+        Count publications grouped by date bucket and the requested dimensions.
+
+        Work is proportional to the number of distinct combinations of the
+        grouped and filtered dimensions per day in range, not to the number
+        of rows.
+
+        Args:
+            start_date (date): First day to count.
+            end_date (date): Last day to count (inclusive).
+            group_by (iterable): Dimensions from DIMENSIONS to group by.
+            granularity (str): Date bucket size, 'day' or 'month'.
+            filters (dict, optional): Dimension values to filter by.
+
+        Returns:
+            dict: The total count and a list of grouped counts.
+        """
+        filters = {
+            name: value for name, value in (filters or {}).items() if value is not None
+        }
+        positions = tuple(
+            i
+            for i, name in enumerate(DIMENSIONS)
+            if name in group_by or name in filters
+        )
+
+        with self._lock:
+            predicates = []
+            for name, value in filters.items():
+                code = self.columns[name].code_of(value)
+                if code is None:
+                    return {"total": 0, "data": []}
+                predicates.append((positions.index(DIMENSIONS.index(name)), code))
+
+            first = bisect_left(self._days, start_date.toordinal())
+            last = bisect_right(self._days, end_date.toordinal())
+            snapshot = []
+            for day in self._days[first:last]:
+                partition = self._partitions[day]
+                if self._is_final(day):
+                    snapshot.append((day, partition.counts, partition.rollups))
+                else:
+                    snapshot.append((day, dict(partition.counts), None))
+            final_before = self.final_before
+            month_rollups = self._month_rollups
+            values = [self.columns[name].values for name in DIMENSIONS]
+
+        def label(item):
+            bucket = date.fromordinal(item[0])
+            if granularity == "month":
+                return bucket.strftime("%Y-%m")
+            return bucket.isoformat()
+
+        def day_rollup(counts, rollups):
+            if rollups is None:
+                return _rollup(counts, positions)
+            rollup = rollups.get(positions)
+            if rollup is None:
+                rollup = rollups[positions] = _rollup(counts, positions)
+            return rollup
+
+        sources = []
+        for timeframe, days in groupby(snapshot, key=label):
+            days = list(days)
+            if granularity == "month" and self._is_cacheable_month(
+                days[0][0], start_date, end_date, final_before
+            ):
+                rollup = month_rollups.get((timeframe, positions))
+                if rollup is None:
+                    rollup = Counter()
+                    for _, counts, rollups in days:
+                        rollup.update(day_rollup(counts, rollups))
+                    month_rollups[(timeframe, positions)] = rollup
+                sources.append((timeframe, rollup))
+            else:
+                for _, counts, rollups in days:
+                    sources.append((timeframe, day_rollup(counts, rollups)))
+
+        keys = [
+            (name, positions.index(i), values[i])
+            for i, name in enumerate(DIMENSIONS)
+            if name in group_by
+        ]
+
+        buckets = Counter()
+        for timeframe, rollup in sources:
+            for codes, count in rollup.items():
+                if all(codes[i] == code for i, code in predicates):
+                    buckets[(timeframe, *(codes[i] for _, i, _ in keys))] += count
+
+        data = []
+        for (timeframe, *codes), count in buckets.items():
+            entry = {"timeframe": timeframe}
+            for (name, _, lookup), code in zip(keys, codes):
+                entry[name] = lookup[code]
+            entry["count"] = count
+            data.append(entry)
+        data.sort(
+            key=lambda entry: (
+                entry["timeframe"],
+                *(entry[name] for name, _, _ in keys),
+            )
+        )
+
+        return {"total": sum(buckets.values()), "data": data}
+
+
+publications_store = PublicationsStore()
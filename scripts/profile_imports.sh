@@ -0,0 +1,30 @@
+#!/bin/bash
+# This program is free software: you can redistribute it under the terms
+# of the GNU General Public License, v. 3.0. If a copy of the GNU General
+# Public License was not distributed with this file, see <https://www.gnu.org/licenses/>.
+
+SCRIPT_ROOT=$(dirname $(readlink -f "${BASH_SOURCE[0]}"))
+PARENT_DIR=$(dirname "$SCRIPT_ROOT")
+. "${SCRIPT_ROOT}/common.sh" || exit 1
+
+MODULE="${1:-main}"
+TOP="${2:-25}"
+REPORT_FILE="$PARENT_DIR/importtime.log"
+
+info "Profiling import time of module '${MODULE}'..."
+(cd "$PARENT_DIR" && python3 -X importtime -c "import ${MODULE}") 2>"$REPORT_FILE"
+
+if [[ $? -ne 0 ]]; then
+    error "Failed to import module '${MODULE}'. See '${REPORT_FILE}'."
+    exit 1
+fi
+
+success "Raw import-time report written to '${REPORT_FILE}'."
+info "Top ${TOP} imports by cumulative time (us):"
+grep "^import time:" "$REPORT_FILE" | grep -v "self \[us\]" |
+    awk -F'|' '{ gsub(/ /, "", $2); print $2 "\t" $3 }' |
+    sort -rn | head -n "$TOP"
+
+TOTAL=$(grep "^import time:" "$REPORT_FILE" | grep -v "self \[us\]" |
+    awk -F'|' -v module="$MODULE" '{ name=$3; gsub(/^ +| +$/, "", name); if (name == module) print $2 }' | tr -d ' ')
+success "Total import time of '${MODULE}': ${TOTAL:-unknown} us."
@@ -0,0 +1,140 @@
+"""
+Tests for the publications store.
+
+This program is free software: you can redistribute it under the terms
+of the GNU General Public License, v. 3.0. If a copy of the GNU General
+Public License was not distributed with this file, see <https://www.gnu.org/licenses/>.
+"""
+
+import unittest
+from datetime import date
+
+from publications_store import PublicationsStore
+
+
+def make_row(row_id, day, platform_name="gmail", status="published", **fields):
+    """Build a publication row as returned by the Publisher API."""
+    row = {
+        "id": row_id,
+        "date_time": f"{day}T12:00:00Z",
+        "country_code": "CM",
+        "platform_name": platform_name,
+        "source": "platforms",
+        "status": status,
+        "gateway_client": "+237",
+    }
+    row.update(fields)
+    return row
+
+
+class PublicationsStoreTest(unittest.TestCase):
+    """Tests for PublicationsStore."""
+
+    def setUp(self):
+        self.store = PublicationsStore()
+        self.store.ingest(
+            [
+                make_row(1, "2025-01-01", "twitter", "failed"),
+                make_row(2, "2025-01-01", "gmail", "failed"),
+                make_row(3, "2025-01-02", "gmail", "published"),
+                make_row(4, "2025-01-31", "gmail", "failed"),
+                make_row(5, "2025-02-01", "gmail", "failed"),
+            ]
+        )
+
+    def count(self, start, end, **kwargs):
+        return self.store.group_count(
+            date.fromisoformat(start), date.fromisoformat(end), **kwargs
+        )
+
+    def test_ingest_skips_duplicate_ids(self):
+        added = self.store.ingest(
+            [make_row(1, "2025-01-01"), make_row(6, "2025-01-01")]
+        )
+
+        self.assertEqual(added, 1)
+        self.assertEqual(len(self.store), 6)
+
+    def test_group_count_filters_on_ungrouped_dimension(self):
+        result = self.count(
+            "2025-01-01",
+            "2025-01-31",
+            group_by=["platform_name"],
+            filters={"status": "failed", "country_code": None},
+        )
+
+        self.assertEqual(result["total"], 3)
+        self.assertEqual(
+            result["data"],
+            [
+                {"timeframe": "2025-01-01", "platform_name": "gmail", "count": 1},
+                {"timeframe": "2025-01-01", "platform_name": "twitter", "count": 1},
+                {"timeframe": "2025-01-31", "platform_name": "gmail", "count": 1},
+            ],
+        )
+
+    def test_group_count_unknown_filter_value(self):
+        result = self.count(
+            "2025-01-01", "2025-12-31", filters={"platform_name": "unknown"}
+        )
+
+        self.assertEqual(result, {"total": 0, "data": []})
+
+    def test_group_count_month_buckets(self):
+        self.store.mark_final_before(date(2025, 3, 1))
+
+        for _ in range(2):
+            result = self.count(
+                "2025-01-01", "2025-02-28", group_by=["status"], granularity="month"
+            )
+            self.assertEqual(
+                result["data"],
+                [
+                    {"timeframe": "2025-01", "status": "failed", "count": 3},
+                    {"timeframe": "2025-01", "status": "published", "count": 1},
+                    {"timeframe": "2025-02", "status": "failed", "count": 1},
+                ],
+            )
+
+    def test_late_row_into_finalized_day(self):
+        self.store.mark_final_before(date(2025, 3, 1))
+        self.store.materialize_rollups()
+        self.count("2025-01-01", "2025-01-31", granularity="month")
+
+        added = self.store.ingest([make_row(7, "2025-01-01")])
+        daily = self.count("2025-01-01", "2025-01-01", group_by=["platform_name"])
+        monthly = self.count("2025-01-01", "2025-01-31", granularity="month")
+
+        self.assertEqual(added, 1)
+        self.assertEqual(
+            daily["data"],
+            [
+                {"timeframe": "2025-01-01", "platform_name": "gmail", "count": 2},
+                {"timeframe": "2025-01-01", "platform_name": "twitter", "count": 1},
+            ],
+        )
+        self.assertEqual(monthly["total"], 5)
+
+    def test_evict_before(self):
+        self.store.mark_final_before(date(2025, 3, 1))
+        self.count("2025-01-01", "2025-01-31", granularity="month")
+
+        evicted = self.store.evict_before(date(2025, 1, 2))
+        monthly = self.count("2025-01-01", "2025-01-31", granularity="month")
+
+        self.assertEqual(evicted, 2)
+        self.assertEqual(self.store.oldest, date(2025, 1, 2))
+        self.assertEqual(monthly["total"], 2)
+
+    def test_pending_start(self):
+        oldest = date(2025, 1, 1)
+        self.assertEqual(self.store.pending_start(oldest), oldest)
+
+        self.store.mark_final_before(date(2025, 2, 1))
+
+        self.assertEqual(self.store.pending_start(oldest), date(2025, 2, 1))
+        self.assertEqual(self.store.pending_start(date(2025, 3, 1)), date(2025, 3, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()